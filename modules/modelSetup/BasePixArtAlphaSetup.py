@@ -70,6 +70,10 @@ class BasePixArtAlphaSetup(
                         f" correctly and a GPU is available: {e}"
                     )
 
+        model.vae.enable_slicing()
+        if config.vae_tiling:
+            model.vae.enable_tiling()
+
         if config.gradient_checkpointing:
             model.vae.enable_gradient_checkpointing()
             enable_checkpointing_for_transformer_blocks(model.transformer, self.train_device)
@@ -318,7 +322,7 @@ class BasePixArtAlphaSetup(
                     if step < truncate_timestep_index:
                         scaled_noisy_latent_image = scaled_noisy_latent_image.detach()
 
-                    if self.debug_mode:
+                    if self._is_debug_step(config, train_progress):
                         with torch.no_grad():
                             # predicted image
                             predicted_image = model.vae.decode(
@@ -400,7 +404,7 @@ class BasePixArtAlphaSetup(
                     'scaled_latent_image': scaled_latent_image,
                 }
 
-            if self.debug_mode:
+            if self._is_debug_step(config, train_progress):
                 with torch.no_grad():
                     self._save_text(
                         self._decode_tokens(batch['tokens'], model.tokenizer),
@@ -23,6 +23,7 @@ from modules.util.conv_util import apply_circular_padding_to_conv2d
 from modules.util.dtype_util import create_autocast_context
 from modules.util.enum.AttentionMechanism import AttentionMechanism
 from modules.util.enum.TrainingMethod import TrainingMethod
+from modules.util.torch_util import compile_module
 
 
 class BaseStableDiffusionSetup(
@@ -37,6 +38,8 @@ class BaseStableDiffusionSetup(
     def __init__(self, train_device: torch.device, temp_device: torch.device, debug_mode: bool):
         super(BaseStableDiffusionSetup, self).__init__(train_device, temp_device, debug_mode)
 
+        self.__compiled_unet = None
+
     def _setup_optimizations(
             self,
             model: StableDiffusionModel,
@@ -65,6 +68,12 @@ class BaseStableDiffusionSetup(
                         f" correctly and a GPU is available: {e}"
                     )
 
+        # slicing doesn't save memory while the vae is trained, and tiling would train it on blended tiles
+        if config.training_method != TrainingMethod.FINE_TUNE_VAE:
+            model.vae.enable_slicing()
+            if config.vae_tiling:
+                model.vae.enable_tiling()
+
         if config.gradient_checkpointing:
             model.vae.enable_gradient_checkpointing()
             model.unet.enable_gradient_checkpointing()
@@ -77,6 +86,8 @@ class BaseStableDiffusionSetup(
             if model.unet_lora is not None:
                 apply_circular_padding_to_conv2d(model.unet_lora)
 
+        self.__compiled_unet = compile_module(model.unet) if config.compile_unet else None
+
         model.autocast_context, model.train_dtype = create_autocast_context(self.train_device, config.train_dtype, [
             config.weight_dtypes().text_encoder,
             config.weight_dtypes().unet,
@@ -285,7 +296,7 @@ class BaseStableDiffusionSetup(
                     if step < truncate_timestep_index:
                         scaled_noisy_latent_image = scaled_noisy_latent_image.detach()
 
-                    if self.debug_mode:
+                    if self._is_debug_step(config, train_progress):
                         with torch.no_grad():
                             # predicted image
                             predicted_image = model.vae.decode(
@@ -338,12 +349,13 @@ class BaseStableDiffusionSetup(
                 else:
                     latent_input = scaled_noisy_latent_image
 
+                unet = self.__compiled_unet if self.__compiled_unet is not None else model.unet
                 if config.model_type.has_depth_input():
-                    predicted_latent_noise = model.unet(
+                    predicted_latent_noise = unet(
                         latent_input, timestep, text_encoder_output, batch['latent_depth']
                     ).sample
                 else:
-                    predicted_latent_noise = model.unet(
+                    predicted_latent_noise = unet(
                         latent_input, timestep, text_encoder_output
                     ).sample
 
@@ -365,7 +377,7 @@ class BaseStableDiffusionSetup(
                         'target': target_velocity,
                     }
 
-            if self.debug_mode:
+            if self._is_debug_step(config, train_progress):
                 with torch.no_grad():
                     self._save_text(
                         self._decode_tokens(batch['tokens'], model.tokenizer),
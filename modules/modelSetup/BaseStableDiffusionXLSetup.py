@@ -2,6 +2,7 @@ from abc import ABCMeta
 from random import Random
 
 import torch
+import torch.nn.functional as F
 from diffusers.models.attention_processor import AttnProcessor, XFormersAttnProcessor, AttnProcessor2_0
 from diffusers.utils import is_xformers_available
 from torch import Tensor
@@ -23,6 +24,7 @@ from modules.util.conv_util import apply_circular_padding_to_conv2d
 from modules.util.dtype_util import create_autocast_context, disable_fp16_autocast_context
 from modules.util.enum.AttentionMechanism import AttentionMechanism
 from modules.util.enum.TrainingMethod import TrainingMethod
+from modules.util.torch_util import compile_module
 
 
 class BaseStableDiffusionXLSetup(
@@ -34,13 +36,25 @@ class BaseStableDiffusionXLSetup(
     metaclass=ABCMeta
 ):
 
+    def __init__(self, train_device: torch.device, temp_device: torch.device, debug_mode: bool):
+        super(BaseStableDiffusionXLSetup, self).__init__(train_device, temp_device, debug_mode)
+
+        self.__alphas_cumprod = None
+        self.__text_encoder_output_buffer = None
+        self.__generator = torch.Generator(device=train_device)
+        self.__timestep_generator = torch.Generator()
+        self.__compiled_unet = None
+
     def _setup_optimizations(
             self,
             model: StableDiffusionXLModel,
             config: TrainConfig,
     ):
         if config.attention_mechanism == AttentionMechanism.DEFAULT:
-            model.unet.set_attn_processor(AttnProcessor())
+            if hasattr(F, "scaled_dot_product_attention"):
+                model.unet.set_attn_processor(AttnProcessor2_0())
+            else:
+                model.unet.set_attn_processor(AttnProcessor())
         elif config.attention_mechanism == AttentionMechanism.XFORMERS and is_xformers_available():
             try:
                 model.unet.set_attn_processor(XFormersAttnProcessor())
@@ -62,11 +76,20 @@ class BaseStableDiffusionXLSetup(
                         f" correctly and a GPU is available: {e}"
                     )
 
+        model.vae.enable_slicing()
+        if config.vae_tiling:
+            model.vae.enable_tiling()
+
         if config.gradient_checkpointing:
             model.unet.enable_gradient_checkpointing()
-            enable_checkpointing_for_transformer_blocks(model.unet, self.train_device)
-            enable_checkpointing_for_clip_encoder_layers(model.text_encoder_1, self.train_device)
-            enable_checkpointing_for_clip_encoder_layers(model.text_encoder_2, self.train_device)
+            # the transformer blocks have no dropout of their own, the rng state is only needed for LoRA dropout
+            enable_checkpointing_for_transformer_blocks(
+                model.unet, self.train_device, preserve_rng_state=config.dropout_probability > 0
+            )
+            if config.text_encoder.train or config.train_any_embedding():
+                enable_checkpointing_for_clip_encoder_layers(model.text_encoder_1, self.train_device)
+            if config.text_encoder_2.train or config.train_any_embedding():
+                enable_checkpointing_for_clip_encoder_layers(model.text_encoder_2, self.train_device)
 
         if config.force_circular_padding:
             apply_circular_padding_to_conv2d(model.vae)
@@ -74,6 +97,8 @@ class BaseStableDiffusionXLSetup(
             if model.unet_lora is not None:
                 apply_circular_padding_to_conv2d(model.unet_lora)
 
+        self.__compiled_unet = compile_module(model.unet) if config.compile_unet else None
+
         model.autocast_context, model.train_dtype = create_autocast_context(self.train_device, config.train_dtype, [
             config.weight_dtypes().unet,
             config.weight_dtypes().text_encoder,
@@ -209,6 +234,7 @@ class BaseStableDiffusionXLSetup(
             text_encoder_2_output: Tensor = None,
             pooled_text_encoder_2_output: Tensor = None,
             text: str = None,
+            reuse_output_buffer: bool = False,
     ):
         if tokens_1 is None and text is not None:
             tokenizer_output = model.tokenizer_1(
@@ -243,10 +269,36 @@ class BaseStableDiffusionXLSetup(
             pooled_text_encoder_2_output = text_encoder_2_output.text_embeds
             text_encoder_2_output = text_encoder_2_output.hidden_states[-(2 + text_encoder_2_layer_skip)]
 
-        text_encoder_output = torch.concat([text_encoder_1_output, text_encoder_2_output], dim=-1)
+        requires_grad = torch.is_grad_enabled() \
+                        and (text_encoder_1_output.requires_grad or text_encoder_2_output.requires_grad)
+        if reuse_output_buffer and not requires_grad:
+            text_encoder_output = self.__concat_into_output_buffer(text_encoder_1_output, text_encoder_2_output)
+        else:
+            text_encoder_output = torch.concat([text_encoder_1_output, text_encoder_2_output], dim=-1)
 
         return text_encoder_output, pooled_text_encoder_2_output
 
+    def __concat_into_output_buffer(
+            self,
+            text_encoder_1_output: Tensor,
+            text_encoder_2_output: Tensor,
+    ) -> Tensor:
+        # copying into the buffer does not support autograd,
+        # so this is only used if the text encoder outputs don't need gradients
+        text_encoder_1_dim = text_encoder_1_output.shape[-1]
+        shape = (*text_encoder_1_output.shape[:-1], text_encoder_1_dim + text_encoder_2_output.shape[-1])
+        dtype = torch.promote_types(text_encoder_1_output.dtype, text_encoder_2_output.dtype)
+        device = text_encoder_1_output.device
+
+        buffer = self.__text_encoder_output_buffer
+        if buffer is None or buffer.shape != shape or buffer.dtype != dtype or buffer.device != device:
+            buffer = torch.empty(shape, dtype=dtype, device=device)
+            self.__text_encoder_output_buffer = buffer
+
+        buffer[..., :text_encoder_1_dim].copy_(text_encoder_1_output)
+        buffer[..., text_encoder_1_dim:].copy_(text_encoder_2_output)
+        return buffer
+
     def predict(
             self,
             model: StableDiffusionXLModel,
@@ -257,8 +309,8 @@ class BaseStableDiffusionXLSetup(
             deterministic: bool = False,
     ) -> dict:
         with model.autocast_context:
-            generator = torch.Generator(device=config.train_device)
-            generator.manual_seed(train_progress.global_step)
+            self.__generator.manual_seed(train_progress.global_step)
+            self.__timestep_generator.manual_seed(train_progress.global_step)
             rand = Random(train_progress.global_step)
 
             is_align_prop_step = config.align_prop and (rand.random() < config.align_prop_probability)
@@ -277,16 +329,16 @@ class BaseStableDiffusionXLSetup(
                     'text_encoder_2_hidden_state'] if not config.text_encoder_2.train and not config.train_any_embedding() else None,
                 pooled_text_encoder_2_output=batch[
                     'text_encoder_2_pooled_state'] if not config.text_encoder_2.train and not config.train_any_embedding() else None,
+                reuse_output_buffer=True,
             )
 
             latent_image = batch['latent_image']
-            scaled_latent_image = latent_image * vae_scaling_factor
 
             scaled_latent_conditioning_image = None
             if config.model_type.has_conditioning_image_input():
                 scaled_latent_conditioning_image = batch['latent_conditioning_image'] * vae_scaling_factor
 
-            latent_noise = self._create_noise(scaled_latent_image, config, generator)
+            latent_noise = self._create_noise(latent_image, config, self.__generator)
 
             if is_align_prop_step and not deterministic:
                 dummy = torch.zeros((1,), device=self.train_device)
@@ -299,11 +351,12 @@ class BaseStableDiffusionXLSetup(
                     text="",
                 )
                 negative_text_encoder_output = negative_text_encoder_output \
-                    .expand((scaled_latent_image.shape[0], -1, -1))
+                    .expand((latent_image.shape[0], -1, -1))
                 negative_pooled_text_encoder_2_output = negative_pooled_text_encoder_2_output \
-                    .expand((scaled_latent_image.shape[0], -1))
+                    .expand((latent_image.shape[0], -1))
 
-                model.noise_scheduler.set_timesteps(config.align_prop_steps)
+                if model.noise_scheduler.num_inference_steps != config.align_prop_steps:
+                    model.noise_scheduler.set_timesteps(config.align_prop_steps)
 
                 scaled_noisy_latent_image = latent_noise
 
@@ -329,12 +382,8 @@ class BaseStableDiffusionXLSetup(
                     crops_coords_left,
                     target_height,
                     target_width
-                ]).unsqueeze(0).expand((scaled_latent_image.shape[0], -1))
-
-                add_time_ids = add_time_ids.to(
-                    dtype=scaled_noisy_latent_image.dtype,
-                    device=scaled_noisy_latent_image.device,
-                )
+                ], dtype=scaled_noisy_latent_image.dtype, device=scaled_noisy_latent_image.device) \
+                    .unsqueeze(0).expand((latent_image.shape[0], -1))
 
                 added_cond_kwargs = {"text_embeds": pooled_text_encoder_2_output, "time_ids": add_time_ids}
                 negative_added_cond_kwargs = {"text_embeds": negative_pooled_text_encoder_2_output,
@@ -344,7 +393,7 @@ class BaseStableDiffusionXLSetup(
 
                 for step in range(config.align_prop_steps):
                     timestep = model.noise_scheduler.timesteps[step] \
-                        .expand((scaled_latent_image.shape[0],)) \
+                        .expand((latent_image.shape[0],)) \
                         .to(device=model.unet.device)
 
                     if config.model_type.has_mask_input() and config.model_type.has_conditioning_image_input():
@@ -378,7 +427,7 @@ class BaseStableDiffusionXLSetup(
                     if step < truncate_timestep_index:
                         scaled_noisy_latent_image = scaled_noisy_latent_image.detach()
 
-                    if self.debug_mode:
+                    if self._is_debug_step(config, train_progress):
                         with torch.no_grad():
                             # predicted image
                             predicted_image = self._project_latent_to_image_sdxl(scaled_noisy_latent_image)
@@ -407,20 +456,22 @@ class BaseStableDiffusionXLSetup(
                     'predicted': predicted_image,
                 }
             else:
+                # timesteps are sampled on the cpu, this avoids launching a random number kernel for a handful of values
                 timestep = self._get_timestep_discrete(
                     model.noise_scheduler,
                     deterministic,
-                    generator,
-                    scaled_latent_image.shape[0],
+                    self.__timestep_generator,
+                    latent_image.shape[0],
                     config,
                     train_progress.global_step,
-                )
+                ).to(device=latent_image.device, non_blocking=True)
 
                 scaled_noisy_latent_image = self._add_noise_discrete(
-                    scaled_latent_image,
+                    latent_image,
                     latent_noise,
                     timestep,
                     model.noise_scheduler.betas,
+                    latent_scaling_factor=vae_scaling_factor,
                 )
 
                 # original size of the image
@@ -453,7 +504,8 @@ class BaseStableDiffusionXLSetup(
                     latent_input = scaled_noisy_latent_image
 
                 added_cond_kwargs = {"text_embeds": pooled_text_encoder_2_output, "time_ids": add_time_ids}
-                predicted_latent_noise = model.unet(
+                unet = self.__compiled_unet if self.__compiled_unet is not None else model.unet
+                predicted_latent_noise = unet(
                     sample=latent_input,
                     timestep=timestep,
                     encoder_hidden_states=text_encoder_output,
@@ -470,7 +522,9 @@ class BaseStableDiffusionXLSetup(
                         'target': latent_noise,
                     }
                 elif model.noise_scheduler.config.prediction_type == 'v_prediction':
-                    target_velocity = model.noise_scheduler.get_velocity(scaled_latent_image, latent_noise, timestep)
+                    target_velocity = model.noise_scheduler.get_velocity(
+                        latent_image * vae_scaling_factor, latent_noise, timestep
+                    )
                     model_output_data = {
                         'loss_type': 'target',
                         'timestep': timestep,
@@ -478,7 +532,7 @@ class BaseStableDiffusionXLSetup(
                         'target': target_velocity,
                     }
 
-            if config.debug_mode:
+            if self._is_debug_step(config, train_progress):
                 with torch.no_grad():
                     self._save_text(
                         self._decode_tokens(batch['tokens_1'], model.tokenizer_1),
@@ -499,7 +553,7 @@ class BaseStableDiffusionXLSetup(
 
                         # image
                         self._save_image(
-                            self._project_latent_to_image_sdxl(scaled_latent_image),
+                            self._project_latent_to_image_sdxl(latent_image * vae_scaling_factor),
                             config.debug_dir + "/training_batches",
                             "2-image",
                             model.train_progress.global_step,
@@ -534,12 +588,11 @@ class BaseStableDiffusionXLSetup(
                         )
 
                         # predicted image
-                        alphas_cumprod = model.noise_scheduler.alphas_cumprod.to(config.train_device)
-                        sqrt_alpha_prod = alphas_cumprod[timestep] ** 0.5
-                        sqrt_alpha_prod = sqrt_alpha_prod.flatten().reshape(-1, 1, 1, 1)
-
-                        sqrt_one_minus_alpha_prod = (1 - alphas_cumprod[timestep]) ** 0.5
-                        sqrt_one_minus_alpha_prod = sqrt_one_minus_alpha_prod.flatten().reshape(-1, 1, 1, 1)
+                        if self.__alphas_cumprod is None:
+                            self.__alphas_cumprod = model.noise_scheduler.alphas_cumprod.to(config.train_device)
+                        alphas_cumprod = self.__alphas_cumprod[timestep].view(-1, 1, 1, 1)
+                        sqrt_alpha_prod = alphas_cumprod ** 0.5
+                        sqrt_one_minus_alpha_prod = (1 - alphas_cumprod) ** 0.5
 
                         scaled_predicted_latent_image = \
                             (scaled_noisy_latent_image - predicted_latent_noise * sqrt_one_minus_alpha_prod) \
@@ -554,7 +607,7 @@ class BaseStableDiffusionXLSetup(
 
                         # image
                         self._save_image(
-                            self._project_latent_to_image_sdxl(scaled_latent_image),
+                            self._project_latent_to_image_sdxl(latent_image * vae_scaling_factor),
                             config.debug_dir + "/training_batches",
                             "5-image",
                             model.train_progress.global_step,
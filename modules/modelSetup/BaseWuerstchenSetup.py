@@ -280,7 +280,7 @@ class BaseWuerstchenSetup(
                 'timestep': timestep,
             }
 
-            if config.debug_mode:
+            if self._is_debug_step(config, train_progress):
                 with torch.no_grad():
                     self._save_text(
                         self._decode_tokens(batch['tokens'], model.prior_tokenizer),
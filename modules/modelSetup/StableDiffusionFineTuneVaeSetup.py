@@ -102,7 +102,7 @@ class StableDiffusionFineTuneVaeSetup(
             'target': image,
         }
 
-        if config.debug_mode:
+        if self._is_debug_step(config, train_progress):
             with torch.no_grad():
                 # image
                 self._save_image(image, config.debug_dir + "/training_batches", "1-image", train_progress.global_step)
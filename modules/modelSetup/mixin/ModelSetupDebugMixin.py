@@ -6,11 +6,18 @@ from PIL import Image
 from torch import Tensor
 from torchvision import transforms
 
+from modules.util.TrainProgress import TrainProgress
+from modules.util.config.TrainConfig import TrainConfig
+
 
 class ModelSetupDebugMixin(metaclass=ABCMeta):
     def __init__(self):
         super(ModelSetupDebugMixin, self).__init__()
 
+    def _is_debug_step(self, config: TrainConfig, train_progress: TrainProgress) -> bool:
+        # intervals below 1 save debug information in every step
+        return config.debug_mode and train_progress.global_step % max(1, config.debug_step_interval) == 0
+
     def _save_image(self, image_tensor: Tensor, directory: str, name: str, step: int, fromarray: bool = False):
         path = os.path.join(directory, "step-" + str(step) + "-" + name + ".png")
         if not os.path.exists(directory):
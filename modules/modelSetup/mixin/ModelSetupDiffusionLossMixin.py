@@ -25,6 +25,7 @@ class ModelSetupDiffusionLossMixin(metaclass=ABCMeta):
         self.__align_prop_loss_fn = None
         self.__coefficients = None
         self.__alphas_cumprod_fun = None
+        self.__clamped_mask_buffer = None
 
     def __align_prop_losses(
             self,
@@ -117,21 +118,18 @@ class ModelSetupDiffusionLossMixin(metaclass=ABCMeta):
     ):
         losses = 0
 
+        if config.mse_strength != 0 or config.mae_strength != 0:
+            # per sample norms are single reductions, they don't materialize the element wise squared/absolute error
+            error = data['predicted'].to(dtype=torch.float32) - data['target'].to(dtype=torch.float32)
+            error = error.flatten(start_dim=1)
+
         # MSE/L2 Loss
         if config.mse_strength != 0:
-            losses += F.mse_loss(
-                data['predicted'].to(dtype=torch.float32),
-                data['target'].to(dtype=torch.float32),
-                reduction='none'
-            ).mean([1, 2, 3]) * config.mse_strength
+            losses += torch.linalg.vector_norm(error, dim=1).square() / error.shape[1] * config.mse_strength
 
         # MAE/L1 Loss
         if config.mae_strength != 0:
-            losses += F.l1_loss(
-                data['predicted'].to(dtype=torch.float32),
-                data['target'].to(dtype=torch.float32),
-                reduction='none'
-            ).mean([1, 2, 3]) * config.mae_strength
+            losses += torch.linalg.vector_norm(error, ord=1, dim=1) / error.shape[1] * config.mae_strength
 
         # VB loss
         if config.vb_loss_strength != 0 and 'predicted_var_values' in data:
@@ -144,12 +142,21 @@ class ModelSetupDiffusionLossMixin(metaclass=ABCMeta):
                 predicted_var_values=data['predicted_var_values'].to(dtype=torch.float32),
             ).mean([1, 2, 3]) * config.vb_loss_strength
 
-        if config.masked_training and config.normalize_masked_area_loss:
-            clamped_mask = torch.clamp(batch['latent_mask'], config.unmasked_weight, 1)
-            mask_mean = clamped_mask.mean(dim=(1, 2, 3))
-            losses /= mask_mean
+        # with unmasked_weight >= 1 the clamped mask is all ones, so normalizing would be a no-op
+        if config.masked_training and config.normalize_masked_area_loss and config.unmasked_weight < 1:
+            losses /= self.__clamped_mask_mean(batch['latent_mask'], config.unmasked_weight)
 
         return losses
+
+    def __clamped_mask_mean(self, mask: Tensor, unmasked_weight: float) -> Tensor:
+        # the clamped mask is only needed to calculate its mean, so the same buffer is reused in every step
+        buffer = self.__clamped_mask_buffer
+        if buffer is None or buffer.shape != mask.shape or buffer.dtype != mask.dtype or buffer.device != mask.device:
+            buffer = torch.empty_like(mask)
+            self.__clamped_mask_buffer = buffer
+
+        torch.clamp(mask, unmasked_weight, 1, out=buffer)
+        return buffer.mean(dim=(1, 2, 3))
     
     def __snr(self, timesteps: Tensor, device: torch.device):
         if self.__coefficients:
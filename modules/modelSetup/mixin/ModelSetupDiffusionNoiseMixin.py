@@ -36,7 +36,7 @@ class ModelSetupDiffusionNoiseMixin(metaclass=ABCMeta):
                 device=config.train_device,
                 dtype=source_tensor.dtype
             )
-            noise = noise + (config.offset_noise_weight * offset_noise)
+            noise.add_(offset_noise, alpha=config.offset_noise_weight)
 
         if config.perturbation_noise_weight > 0:
             perturbation_noise = torch.randn(
@@ -45,7 +45,7 @@ class ModelSetupDiffusionNoiseMixin(metaclass=ABCMeta):
                 device=config.train_device,
                 dtype=source_tensor.dtype
             )
-            noise = noise + (config.perturbation_noise_weight * perturbation_noise)
+            noise.add_(perturbation_noise, alpha=config.perturbation_noise_weight)
 
         return noise
 
@@ -117,25 +117,27 @@ class ModelSetupDiffusionNoiseMixin(metaclass=ABCMeta):
 
     def _add_noise_discrete(
             self,
-            scaled_latent_image: Tensor,
+            latent_image: Tensor,
             latent_noise: Tensor,
             timestep: Tensor,
             betas: Tensor,
+            latent_scaling_factor: float = 1.0,
     ) -> Tensor:
         if self.__coefficients is None:
-            betas = betas.to(device=scaled_latent_image.device)
+            betas = betas.to(device=latent_image.device)
             self.__coefficients = DiffusionScheduleCoefficients.from_betas(betas)
 
-        orig_dtype = scaled_latent_image.dtype
+        orig_dtype = latent_image.dtype
 
-        sqrt_alphas_cumprod = self.__coefficients.sqrt_alphas_cumprod[timestep]
+        # the scaling factor is applied to the per sample coefficient instead of the whole latent image
+        sqrt_alphas_cumprod = self.__coefficients.sqrt_alphas_cumprod[timestep] * latent_scaling_factor
         sqrt_one_minus_alphas_cumprod = self.__coefficients.sqrt_one_minus_alphas_cumprod[timestep]
 
-        while sqrt_alphas_cumprod.dim() < scaled_latent_image.dim():
+        while sqrt_alphas_cumprod.dim() < latent_image.dim():
             sqrt_alphas_cumprod = sqrt_alphas_cumprod.unsqueeze(-1)
             sqrt_one_minus_alphas_cumprod = sqrt_one_minus_alphas_cumprod.unsqueeze(-1)
 
-        scaled_noisy_latent_image = scaled_latent_image.to(dtype=sqrt_alphas_cumprod.dtype) * sqrt_alphas_cumprod \
+        scaled_noisy_latent_image = latent_image.to(dtype=sqrt_alphas_cumprod.dtype) * sqrt_alphas_cumprod \
                                     + latent_noise.to(dtype=sqrt_alphas_cumprod.dtype) * sqrt_one_minus_alphas_cumprod
 
         return scaled_noisy_latent_image.to(dtype=orig_dtype)
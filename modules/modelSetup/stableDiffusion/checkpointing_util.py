@@ -1,3 +1,5 @@
+import inspect
+from functools import partial
 from typing import Callable
 
 import torch
@@ -8,10 +10,54 @@ from torch.utils.checkpoint import checkpoint
 from transformers.models.clip.modeling_clip import CLIPEncoderLayer
 from transformers.models.t5.modeling_t5 import T5Block
 
+# outputs of these ops are saved during the forward pass of a selectively checkpointed block,
+# everything else (norms, activations, residuals) is recomputed during the backward pass
+SELECTIVE_CHECKPOINTING_SAVED_OPS = [
+    '_scaled_dot_product_flash_attention',
+    '_scaled_dot_product_efficient_attention',
+    '_scaled_dot_product_cudnn_attention',
+    'mm',
+    'addmm',  # linear layers with a bias
+    'bmm',
+]
 
-def create_checkpointed_forward(orig_module: nn.Module, device: torch.device) -> Callable:
+# if selective checkpointing is not supported, transformer blocks with shorter sequences are not checkpointed
+MIN_CHECKPOINTING_SEQUENCE_LENGTH = 256
+
+# determinism_check was added in PyTorch 2.1, older versions would pass it on to the checkpointed function
+SUPPORTS_DETERMINISM_CHECK = 'determinism_check' in inspect.signature(checkpoint).parameters
+
+
+def create_selective_checkpointing_context_fn() -> Callable | None:
+    if not hasattr(torch.utils.checkpoint, 'create_selective_checkpoint_contexts'):
+        return None
+
+    saved_ops = [
+        getattr(torch.ops.aten, op_name).default
+        for op_name in SELECTIVE_CHECKPOINTING_SAVED_OPS
+        if hasattr(torch.ops.aten, op_name)
+    ]
+
+    return partial(torch.utils.checkpoint.create_selective_checkpoint_contexts, saved_ops)
+
+
+def create_checkpointed_forward(
+        orig_module: nn.Module,
+        device: torch.device,
+        context_fn: Callable | None = None,
+        preserve_rng_state: bool = True,
+        check_determinism: bool = True,
+) -> Callable:
     orig_forward = orig_module.forward
 
+    checkpoint_kwargs = {}
+    if context_fn is not None:
+        checkpoint_kwargs['context_fn'] = context_fn
+    if not preserve_rng_state:
+        checkpoint_kwargs['preserve_rng_state'] = False
+    if not check_determinism and SUPPORTS_DETERMINISM_CHECK:
+        checkpoint_kwargs['determinism_check'] = 'none'
+
     def custom_forward(
             # dummy tensor that requires grad is needed for checkpointing to work when training a LoRA
             dummy: torch.Tensor = None,
@@ -35,16 +81,51 @@ def create_checkpointed_forward(orig_module: nn.Module, device: torch.device) ->
             dummy,
             *args,
             **kwargs,
-            use_reentrant=False
+            use_reentrant=False,
+            **checkpoint_kwargs,
+        )
+
+    return forward
+
+
+def create_selective_checkpointed_forward(
+        orig_module: nn.Module,
+        device: torch.device,
+        preserve_rng_state: bool = True,
+) -> Callable:
+    context_fn = create_selective_checkpointing_context_fn()
+    if context_fn is not None:
+        return create_checkpointed_forward(
+            orig_module, device, context_fn, preserve_rng_state=preserve_rng_state, check_determinism=False
         )
 
+    orig_forward = orig_module.forward
+    checkpointed_forward = create_checkpointed_forward(
+        orig_module, device, preserve_rng_state=preserve_rng_state, check_determinism=False
+    )
+
+    def forward(
+            hidden_states: torch.Tensor,
+            *args,
+            **kwargs
+    ):
+        # recomputing short sequences saves almost no memory
+        if hidden_states.shape[1] < MIN_CHECKPOINTING_SEQUENCE_LENGTH:
+            return orig_forward(hidden_states, *args, **kwargs)
+
+        return checkpointed_forward(hidden_states, *args, **kwargs)
+
     return forward
 
 
-def enable_checkpointing_for_transformer_blocks(orig_module: nn.Module, device: torch.device):
+def enable_checkpointing_for_transformer_blocks(
+        orig_module: nn.Module,
+        device: torch.device,
+        preserve_rng_state: bool = True,
+):
     for name, child_module in orig_module.named_modules():
         if isinstance(child_module, BasicTransformerBlock):
-            child_module.forward = create_checkpointed_forward(child_module, device)
+            child_module.forward = create_selective_checkpointed_forward(child_module, device, preserve_rng_state)
 
 
 def enable_checkpointing_for_clip_encoder_layers(orig_module: nn.Module, device: torch.device):
@@ -176,27 +176,31 @@ class TrainUI(ctk.CTk):
                          tooltip="The directory where debug data is saved")
         components.dir_entry(master, 5, 1, self.ui_state, "debug_dir")
 
+        components.label(master, 6, 0, "Debug Step Interval",
+                         tooltip="Number of training steps between saved debug information. Values below 1 save debug information in every step")
+        components.entry(master, 6, 1, self.ui_state, "debug_step_interval")
+
         # tensorboard
-        components.label(master, 6, 0, "Tensorboard",
+        components.label(master, 7, 0, "Tensorboard",
                          tooltip="Starts the Tensorboard Web UI during training")
-        components.switch(master, 6, 1, self.ui_state, "tensorboard")
+        components.switch(master, 7, 1, self.ui_state, "tensorboard")
 
-        components.label(master, 7, 0, "Expose Tensorboard",
+        components.label(master, 8, 0, "Expose Tensorboard",
                          tooltip="Exposes Tensorboard Web UI to all network interfaces (makes it accessible from the network)")
-        components.switch(master, 7, 1, self.ui_state, "tensorboard_expose")
+        components.switch(master, 8, 1, self.ui_state, "tensorboard_expose")
 
         # device
-        components.label(master, 8, 0, "Dataloader Threads",
+        components.label(master, 9, 0, "Dataloader Threads",
                          tooltip="Number of threads used for the data loader. Increase if your GPU has room during caching, decrease if it's going out of memory during caching.")
-        components.entry(master, 8, 1, self.ui_state, "dataloader_threads")
+        components.entry(master, 9, 1, self.ui_state, "dataloader_threads")
 
-        components.label(master, 9, 0, "Train Device",
+        components.label(master, 10, 0, "Train Device",
                          tooltip="The device used for training. Can be \"cuda\", \"cuda:0\", \"cuda:1\" etc. Default:\"cuda\"")
-        components.entry(master, 9, 1, self.ui_state, "train_device")
+        components.entry(master, 10, 1, self.ui_state, "train_device")
 
-        components.label(master, 10, 0, "Temp Device",
+        components.label(master, 11, 0, "Temp Device",
                          tooltip="The device used to temporarily offload models while they are not used. Default:\"cpu\"")
-        components.entry(master, 10, 1, self.ui_state, "temp_device")
+        components.entry(master, 11, 1, self.ui_state, "temp_device")
 
     def create_model_tab(self, master):
         return ModelTab(master, self.train_config, self.ui_state)
@@ -445,6 +449,9 @@ class TrainUI(ctk.CTk):
         if self.model_tab:
             self.model_tab.refresh_ui()
 
+        if self.training_tab:
+            self.training_tab.refresh_ui()
+
         if training_method != TrainingMethod.LORA and "LoRA" in self.tabview._tab_dict:
             self.tabview.delete("LoRA")
         if training_method != TrainingMethod.EMBEDDING and "embedding" in self.tabview._tab_dict:
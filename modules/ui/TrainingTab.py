@@ -11,6 +11,7 @@ from modules.util.enum.LearningRateScheduler import LearningRateScheduler
 from modules.util.enum.LossScaler import LossScaler
 from modules.util.enum.LossWeight import LossWeight
 from modules.util.enum.Optimizer import Optimizer
+from modules.util.enum.TrainingMethod import TrainingMethod
 from modules.util.optimizer_util import change_optimizer
 from modules.util.ui import components
 from modules.util.ui.UIState import UIState
@@ -69,7 +70,9 @@ class TrainingTab:
         self.__create_text_encoder_frame(column_0, 1)
         self.__create_embedding_frame(column_0, 2)
 
-        self.__create_base2_frame(column_1, 0)
+        self.__create_base2_frame(
+            column_1, 0, supports_vae_tiling=self.train_config.training_method != TrainingMethod.FINE_TUNE_VAE
+        )
         self.__create_unet_frame(column_1, 1)
         self.__create_noise_frame(column_1, 2)
 
@@ -83,7 +86,7 @@ class TrainingTab:
         self.__create_text_encoder_2_frame(column_0, 2)
         self.__create_embedding_frame(column_0, 3)
 
-        self.__create_base2_frame(column_1, 0)
+        self.__create_base2_frame(column_1, 0, supports_vae_tiling=True)
         self.__create_unet_frame(column_1, 1)
         self.__create_noise_frame(column_1, 2)
 
@@ -96,7 +99,7 @@ class TrainingTab:
         self.__create_text_encoder_frame(column_0, 1)
         self.__create_embedding_frame(column_0, 2)
 
-        self.__create_base2_frame(column_1, 0)
+        self.__create_base2_frame(column_1, 0, supports_vae_tiling=False)
         self.__create_prior_frame(column_1, 1)
         self.__create_noise_frame(column_1, 2)
 
@@ -108,7 +111,7 @@ class TrainingTab:
         self.__create_text_encoder_frame(column_0, 1)
         self.__create_embedding_frame(column_0, 2)
 
-        self.__create_base2_frame(column_1, 0)
+        self.__create_base2_frame(column_1, 0, supports_vae_tiling=True)
         self.__create_prior_frame(column_1, 1)
         self.__create_noise_frame(column_1, 2)
 
@@ -169,7 +172,7 @@ class TrainingTab:
         components.options(frame, 8, 1, [str(x) for x in list(LearningRateScaler)], self.ui_state,
                            "learning_rate_scaler")
 
-    def __create_base2_frame(self, master, row):
+    def __create_base2_frame(self, master, row, supports_vae_tiling: bool):
         frame = ctk.CTkFrame(master=master, corner_radius=5)
         frame.grid(row=row, column=0, padx=5, pady=5, sticky="nsew")
         frame.grid_columnconfigure(0, weight=1)
@@ -234,6 +237,12 @@ class TrainingTab:
                          tooltip="Enables circular padding for all conv layers to better train seamless images")
         components.switch(frame, 9, 1, self.ui_state, "force_circular_padding")
 
+        # vae tiling
+        if supports_vae_tiling:
+            components.label(frame, 10, 0, "VAE Tiling",
+                             tooltip="Encodes and decodes large images in overlapping tiles. This reduces memory usage of the VAE, but can introduce slight seams")
+            components.switch(frame, 10, 1, self.ui_state, "vae_tiling")
+
     def __create_align_prop_frame(self, master, row):
         frame = ctk.CTkFrame(master=master, corner_radius=5)
         frame.grid(row=row, column=0, padx=5, pady=5, sticky="nsew")
@@ -392,6 +401,11 @@ class TrainingTab:
                          tooltip="Rescales the noise scheduler to a zero terminal signal to noise ratio and switches the model to a v-prediction target")
         components.switch(frame, 3, 1, self.ui_state, "rescale_noise_scheduler_to_zero_terminal_snr")
 
+        # compile unet
+        components.label(frame, 4, 0, "Compile UNet",
+                         tooltip="Compiles the UNet with torch.compile. This can increase training speed, but the first steps take a long time and the second resolution triggers one more compilation. Not supported on Windows")
+        components.switch(frame, 4, 1, self.ui_state, "compile_unet")
+
     def __create_prior_frame(self, master, row):
         frame = ctk.CTkFrame(master=master, corner_radius=5)
         frame.grid(row=row, column=0, padx=5, pady=5, sticky="nsew")
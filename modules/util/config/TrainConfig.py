@@ -191,6 +191,7 @@ class TrainConfig(BaseConfig):
     model_type: ModelType
     debug_mode: bool
     debug_dir: str
+    debug_step_interval: int
     workspace_dir: str
     cache_dir: str
     tensorboard: bool
@@ -206,6 +207,8 @@ class TrainConfig(BaseConfig):
     output_model_destination: str
     gradient_checkpointing: bool
     force_circular_padding: bool
+    vae_tiling: bool
+    compile_unet: bool
 
     # data settings
     concept_file_name: str
@@ -542,6 +545,7 @@ class TrainConfig(BaseConfig):
         data.append(("model_type", ModelType.STABLE_DIFFUSION_15, ModelType, False))
         data.append(("debug_mode", False, bool, False))
         data.append(("debug_dir", "debug", str, False))
+        data.append(("debug_step_interval", 100, int, False))
         data.append(("workspace_dir", "workspace/run", str, False))
         data.append(("cache_dir", "workspace-cache/run", str, False))
         data.append(("tensorboard", True, bool, False))
@@ -557,6 +561,8 @@ class TrainConfig(BaseConfig):
         data.append(("output_model_destination", "models/model.safetensors", str, False))
         data.append(("gradient_checkpointing", True, bool, False))
         data.append(("force_circular_padding", False, bool, False))
+        data.append(("vae_tiling", False, bool, False))
+        data.append(("compile_unet", False, bool, False))
 
         # data settings
         data.append(("concept_file_name", "training_concepts/concepts.json", str, False))
@@ -308,7 +308,11 @@ def create_optimizer(
 
         # ADAM Optimizer
         case Optimizer.ADAM:
-            if optimizer_config.stochastic_rounding and (optimizer_config.fused or optimizer_config.foreach):
+            # the fused back pass steps each parameter separately, which the fused and foreach versions can't do
+            fused = optimizer_config.fused and not optimizer_config.fused_back_pass
+            foreach = optimizer_config.foreach and not optimizer_config.fused_back_pass
+
+            if optimizer_config.stochastic_rounding and (fused or foreach):
                 raise RuntimeError('"stochastic_rounding" is only allowed when "fused" and "foreach" are disabled')
 
             optimizer = torch.optim.Adam(
@@ -319,20 +323,23 @@ def create_optimizer(
                 weight_decay=optimizer_config.weight_decay if optimizer_config.weight_decay is not None else 0,
                 eps=optimizer_config.eps if optimizer_config.eps is not None else 1e-8,
                 amsgrad=optimizer_config.amsgrad if optimizer_config.amsgrad is not None else False,
-                foreach=optimizer_config.foreach if optimizer_config.foreach is not None else False,
+                foreach=foreach if foreach is not None else False,
                 maximize=optimizer_config.maximize if optimizer_config.maximize is not None else False,
                 capturable=optimizer_config.capturable if optimizer_config.capturable is not None else False,
                 differentiable=optimizer_config.differentiable if optimizer_config.differentiable is not None else False,
-                fused=optimizer_config.fused if optimizer_config.fused is not None else False,
+                fused=fused if fused is not None else False,
             )
 
-            if optimizer_config.stochastic_rounding:
-                # TODO: only patch if fused/foreach is disabled
+            if optimizer_config.stochastic_rounding or optimizer_config.fused_back_pass:
                 patch_adam(optimizer, optimizer_config.stochastic_rounding)
 
         # ADAMW Optimizer
         case Optimizer.ADAMW:
-            if optimizer_config.stochastic_rounding and (optimizer_config.fused or optimizer_config.foreach):
+            # the fused back pass steps each parameter separately, which the fused and foreach versions can't do
+            fused = optimizer_config.fused and not optimizer_config.fused_back_pass
+            foreach = optimizer_config.foreach and not optimizer_config.fused_back_pass
+
+            if optimizer_config.stochastic_rounding and (fused or foreach):
                 raise RuntimeError('"stochastic_rounding" is only allowed when "fused" and "foreach" are disabled')
 
             optimizer = torch.optim.AdamW(
@@ -343,15 +350,14 @@ def create_optimizer(
                 weight_decay=optimizer_config.weight_decay if optimizer_config.weight_decay is not None else 1e-2,
                 eps=optimizer_config.eps if optimizer_config.eps is not None else 1e-8,
                 amsgrad=optimizer_config.amsgrad if optimizer_config.amsgrad is not None else False,
-                foreach=optimizer_config.foreach if optimizer_config.foreach is not None else False,
+                foreach=foreach if foreach is not None else False,
                 maximize=optimizer_config.maximize if optimizer_config.maximize is not None else False,
                 capturable=optimizer_config.capturable if optimizer_config.capturable is not None else False,
                 differentiable=optimizer_config.differentiable if optimizer_config.differentiable is not None else False,
-                fused=optimizer_config.fused if optimizer_config.fused is not None else False,
+                fused=fused if fused is not None else False,
             )
 
-            if optimizer_config.stochastic_rounding:
-                # TODO: only patch if fused/foreach is disabled
+            if optimizer_config.stochastic_rounding or optimizer_config.fused_back_pass:
                 patch_adamw(optimizer, optimizer_config.stochastic_rounding)
 
         # ADAM_8BIT Optimizer
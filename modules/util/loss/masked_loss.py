@@ -8,6 +8,10 @@ def masked_losses(
         unmasked_weight: float,
         normalize_masked_area_loss: bool
 ) -> Tensor:
+    if unmasked_weight >= 1:
+        # the clamped mask would be all ones
+        return losses
+
     clamped_mask = torch.clamp(mask, unmasked_weight, 1)
 
     losses *= clamped_mask
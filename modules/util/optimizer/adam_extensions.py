@@ -139,6 +139,50 @@ def _single_tensor_adam(
             max_exp_avg_sqs[i] = torch.view_as_complex(max_exp_avg_sqs[i])
 
 
+@_use_grad_for_differentiable
+def step_adam_parameter(self, p, group, i):
+    if p.grad is None:
+        return
+
+    params_with_grad = []
+    grads = []
+    exp_avgs = []
+    exp_avg_sqs = []
+    max_exp_avg_sqs = []
+    state_steps = []
+    beta1, beta2 = group['betas']
+
+    self._init_group(
+        {**group, 'params': [p]},
+        params_with_grad,
+        grads,
+        exp_avgs,
+        exp_avg_sqs,
+        max_exp_avg_sqs,
+        state_steps)
+
+    _single_tensor_adam(
+        params=params_with_grad,
+        grads=grads,
+        exp_avgs=exp_avgs,
+        exp_avg_sqs=exp_avg_sqs,
+        max_exp_avg_sqs=max_exp_avg_sqs,
+        state_steps=state_steps,
+        grad_scale=None,
+        found_inf=None,
+        amsgrad=group['amsgrad'],
+        beta1=beta1,
+        beta2=beta2,
+        lr=group['lr'],
+        weight_decay=group['weight_decay'],
+        eps=group['eps'],
+        maximize=group['maximize'],
+        capturable=group['capturable'],
+        differentiable=group['differentiable'],
+        stochastic_rounding=self.stochastic_rounding,
+    )
+
+
 @_use_grad_for_differentiable
 def step_adam(self, closure=None):
     """Performs a single optimization step.
@@ -198,4 +242,4 @@ def step_adam(self, closure=None):
 def patch_adam(optimizer: Adam, stochastic_rounding: bool):
     optimizer.stochastic_rounding = stochastic_rounding
     optimizer.step = step_adam.__get__(optimizer, Adam)
-    # optimizer.step_parameter = step_adam_parameter.__get__(optimizer, Adam)
+    optimizer.step_parameter = step_adam_parameter.__get__(optimizer, Adam)
@@ -258,6 +258,7 @@ OPTIMIZER_DEFAULT_PARAMETERS = {
         "differentiable": False,
         "fused": True,
         "stochastic_rounding": False,
+        "fused_back_pass": False,
     },
     Optimizer.ADAMW: {
         "beta1": 0.9,
@@ -271,6 +272,7 @@ OPTIMIZER_DEFAULT_PARAMETERS = {
         "differentiable": False,
         "fused": True,
         "stochastic_rounding": False,
+        "fused_back_pass": False,
     },
     Optimizer.SGD: {
         "momentum": 0,
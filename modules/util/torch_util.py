@@ -2,6 +2,7 @@ import gc
 
 import torch
 import accelerate
+from torch import nn
 
 accelerator = accelerate.Accelerator()
 default_device = accelerator.device
@@ -19,3 +20,16 @@ def torch_gc():
     
     if torch.backends.mps.is_available():
         torch.mps.empty_cache()
+
+
+def compile_module(module: nn.Module) -> nn.Module | None:
+    try:
+        # dynamic shapes are detected automatically after the first recompilation,
+        # so new resolution buckets don't each need their own graph
+        return torch.compile(module, mode='max-autotune-no-cudagraphs')
+    except Exception as e:
+        print(
+            f"Could not compile {module.__class__.__name__}, falling back to eager execution."
+            f" Note that torch.compile is not supported on Windows: {e}"
+        )
+        return None